@@ -0,0 +1,70 @@
+package main
+
+import (
+	"sync"
+	"time"
+)
+
+// defaultBatchConcurrency bounds in-flight batch entries when the request
+// does not set max_concurrency.
+const defaultBatchConcurrency = 8
+
+// batchEntry is one query in a batch request; model and config are shared.
+type batchEntry struct {
+	Query        string `json:"query"`
+	Context      string `json:"context"`
+	ContextFrame bool   `json:"context_frame,omitempty"` // --daemon: context follows as a raw frame
+}
+
+// handleBatch runs every entry of a batch request and returns their
+// responses in request order. A failing entry reports its own error field
+// without failing the rest of the batch.
+func handleBatch(req requestPayload) *responsePayload {
+	results := make([]*responsePayload, len(req.Batch))
+	runBatch(req, func(idx int, resp *responsePayload) {
+		results[idx] = resp
+	})
+	return &responsePayload{Result: "batch_complete", Batch: results}
+}
+
+// runBatch runs every entry of a batch request on a bounded worker pool,
+// passing each entry's index and response to done as soon as that entry
+// finishes. done may be called from several goroutines at once.
+func runBatch(req requestPayload, done func(idx int, resp *responsePayload)) {
+	concurrency := req.MaxConcurrency
+	if concurrency <= 0 {
+		concurrency = defaultBatchConcurrency
+	}
+
+	// Worker pool
+	var wg sync.WaitGroup
+	entryChan := make(chan int, len(req.Batch))
+	for i := range req.Batch {
+		entryChan <- i
+	}
+	close(entryChan)
+
+	for w := 0; w < concurrency && w < len(req.Batch); w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for idx := range entryChan {
+				entry := req.Batch[idx]
+				start := time.Now()
+				resp, err := handleRequest(requestPayload{
+					Model:   req.Model,
+					Query:   entry.Query,
+					Context: entry.Context,
+					Config:  req.Config,
+				})
+				if err != nil {
+					resp = &responsePayload{Error: err.Error()}
+				}
+				resp.DurationNs = time.Since(start).Nanoseconds()
+				done(idx, resp)
+			}
+		}()
+	}
+
+	wg.Wait()
+}
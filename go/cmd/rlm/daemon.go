@@ -0,0 +1,196 @@
+package main
+
+import (
+	"bufio"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"os"
+	"os/signal"
+	"sync"
+	"syscall"
+)
+
+// defaultSocketPath is where --daemon listens when no path is given.
+const defaultSocketPath = "/tmp/rlm.sock"
+
+// maxFrameSize bounds a single request frame (256 MiB).
+const maxFrameSize = 256 << 20
+
+// daemon serves requests on a Unix domain socket until SIGINT/SIGTERM.
+// Every frame, in both directions, is a uvarint byte length followed by that
+// many bytes of JSON, except for raw context frames (see readContextFrames).
+// Connections are served concurrently; requests on one connection are
+// answered in order. Request failures are reported in the response's error
+// field and the connection stays open.
+func daemon(socketPath string) error {
+	// Clear a stale socket left behind by a previous daemon, but never
+	// another kind of file that happens to be at the path
+	if info, err := os.Lstat(socketPath); err == nil {
+		if info.Mode()&os.ModeSocket == 0 {
+			return fmt.Errorf("%s exists and is not a socket", socketPath)
+		}
+		if err := os.Remove(socketPath); err != nil {
+			return fmt.Errorf("failed to remove stale socket %s: %w", socketPath, err)
+		}
+	}
+
+	ln, err := net.Listen("unix", socketPath)
+	if err != nil {
+		return fmt.Errorf("failed to listen on %s: %w", socketPath, err)
+	}
+	defer ln.Close()
+
+	sigs := make(chan os.Signal, 1)
+	signal.Notify(sigs, syscall.SIGINT, syscall.SIGTERM)
+	go func() {
+		<-sigs
+		ln.Close()
+	}()
+
+	for {
+		conn, err := ln.Accept()
+		if err != nil {
+			if errors.Is(err, net.ErrClosed) {
+				return nil
+			}
+			return fmt.Errorf("failed to accept connection: %w", err)
+		}
+		go serveConn(conn)
+	}
+}
+
+// serveConn answers framed requests on conn until the peer disconnects.
+func serveConn(conn net.Conn) {
+	defer conn.Close()
+	r := bufio.NewReader(conn)
+	w := bufio.NewWriter(conn)
+
+	for {
+		frame, err := readFrame(r)
+		if err != nil {
+			if !errors.Is(err, io.EOF) {
+				fmt.Fprintln(os.Stderr, "rlm daemon:", err)
+			}
+			return
+		}
+
+		var req requestPayload
+		resp := &responsePayload{}
+		parseErr := json.Unmarshal(frame, &req)
+		if parseErr != nil {
+			resp.Error = fmt.Sprintf("failed to parse input JSON: %v", parseErr)
+		} else if err := readContextFrames(r, &req); err != nil {
+			fmt.Fprintln(os.Stderr, "rlm daemon:", err)
+			return
+		} else if req.Stream && len(req.Batch) > 0 {
+			if err := streamBatch(w, req); err != nil {
+				fmt.Fprintln(os.Stderr, "rlm daemon:", err)
+				return
+			}
+			continue
+		} else if result, err := handleRequest(req); err != nil {
+			resp.Error = err.Error()
+		} else {
+			resp = result
+		}
+
+		if err := writeFrame(w, encodeResponse(resp)); err != nil {
+			fmt.Fprintln(os.Stderr, "rlm daemon:", err)
+			return
+		}
+		if parseErr != nil {
+			// Any raw context frames that followed cannot be told apart
+			// from requests, so the rest of the stream is unusable
+			return
+		}
+	}
+}
+
+// streamBatch answers a batch request flagged stream with one frame per
+// entry, written as soon as that entry finishes and carrying its index,
+// followed by a final batch_complete frame with no entries. Only a failure
+// to write is returned; request failures go in the frames' error fields.
+func streamBatch(w *bufio.Writer, req requestPayload) error {
+	if req.Model == "" {
+		return writeFrame(w, encodeResponse(&responsePayload{Error: "missing model in request payload"}))
+	}
+
+	var mu sync.Mutex
+	var writeErr error
+	runBatch(req, func(idx int, resp *responsePayload) {
+		resp.Index = &idx
+		mu.Lock()
+		defer mu.Unlock()
+		if writeErr == nil {
+			writeErr = writeFrame(w, encodeResponse(resp))
+		}
+	})
+	if writeErr != nil {
+		return writeErr
+	}
+	return writeFrame(w, encodeResponse(&responsePayload{Result: "batch_complete"}))
+}
+
+// readContextFrames fills in contexts sent out of band. A request, and each
+// batch entry in order, with context_frame set is followed by one frame of
+// raw UTF-8 context bytes, sparing large contexts JSON escaping and parsing.
+func readContextFrames(r *bufio.Reader, req *requestPayload) error {
+	if req.ContextFrame {
+		frame, err := readFrame(r)
+		if err != nil {
+			return err
+		}
+		req.Context = string(frame)
+	}
+	for i := range req.Batch {
+		if req.Batch[i].ContextFrame {
+			frame, err := readFrame(r)
+			if err != nil {
+				return err
+			}
+			req.Batch[i].Context = string(frame)
+		}
+	}
+	return nil
+}
+
+// encodeResponse encodes a response frame, reporting an encoding failure in
+// the error field instead.
+func encodeResponse(resp *responsePayload) []byte {
+	payload, err := json.Marshal(resp)
+	if err != nil {
+		payload, _ = json.Marshal(responsePayload{Error: fmt.Sprintf("failed to encode response JSON: %v", err)})
+	}
+	return payload
+}
+
+func readFrame(r *bufio.Reader) ([]byte, error) {
+	size, err := binary.ReadUvarint(r)
+	if err != nil {
+		return nil, err
+	}
+	if size > maxFrameSize {
+		return nil, fmt.Errorf("frame of %d bytes exceeds limit of %d", size, maxFrameSize)
+	}
+	buf := make([]byte, size)
+	if _, err := io.ReadFull(r, buf); err != nil {
+		return nil, fmt.Errorf("failed to read frame: %w", err)
+	}
+	return buf, nil
+}
+
+func writeFrame(w *bufio.Writer, payload []byte) error {
+	var prefix [binary.MaxVarintLen64]byte
+	n := binary.PutUvarint(prefix[:], uint64(len(payload)))
+	if _, err := w.Write(prefix[:n]); err != nil {
+		return err
+	}
+	if _, err := w.Write(payload); err != nil {
+		return err
+	}
+	return w.Flush()
+}
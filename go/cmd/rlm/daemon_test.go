@@ -0,0 +1,259 @@
+package main
+
+import (
+	"bufio"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"strings"
+	"testing"
+	"time"
+)
+
+// stubRunRequest answers every request with its query and context instead of
+// calling an LLM, and fails queries starting with "fail".
+func stubRunRequest(t *testing.T) {
+	t.Helper()
+	original := runRequest
+	runRequest = func(req requestPayload) (*responsePayload, error) {
+		if strings.HasPrefix(req.Query, "fail") {
+			return nil, errors.New("stub failure: " + req.Query)
+		}
+		return &responsePayload{Result: req.Query + "|" + req.Context}, nil
+	}
+	t.Cleanup(func() { runRequest = original })
+}
+
+// daemonConn serves one end of an in-memory connection with serveConn and
+// returns the other end.
+func daemonConn(t *testing.T) (net.Conn, *bufio.Reader) {
+	t.Helper()
+	client, server := net.Pipe()
+	done := make(chan struct{})
+	go func() {
+		defer close(done)
+		serveConn(server)
+	}()
+	t.Cleanup(func() {
+		client.Close()
+		<-done
+	})
+	if err := client.SetDeadline(time.Now().Add(5 * time.Second)); err != nil {
+		t.Fatal(err)
+	}
+	return client, bufio.NewReader(client)
+}
+
+// send writes frames from a goroutine, since net.Pipe blocks each write until
+// the daemon reads it.
+func send(t *testing.T, conn net.Conn, frames ...[]byte) {
+	t.Helper()
+	go func() {
+		w := bufio.NewWriter(conn)
+		for _, frame := range frames {
+			if err := writeFrame(w, frame); err != nil {
+				return
+			}
+		}
+	}()
+}
+
+func request(t *testing.T, req map[string]interface{}) []byte {
+	t.Helper()
+	frame, err := json.Marshal(req)
+	if err != nil {
+		t.Fatal(err)
+	}
+	return frame
+}
+
+func receive(t *testing.T, r *bufio.Reader) *responsePayload {
+	t.Helper()
+	frame, err := readFrame(r)
+	if err != nil {
+		t.Fatalf("reading response frame: %v", err)
+	}
+	var resp responsePayload
+	if err := json.Unmarshal(frame, &resp); err != nil {
+		t.Fatalf("decoding response %q: %v", frame, err)
+	}
+	return &resp
+}
+
+func expectClosed(t *testing.T, r *bufio.Reader) {
+	t.Helper()
+	if _, err := r.ReadByte(); !errors.Is(err, io.EOF) {
+		t.Fatalf("expected the daemon to close the connection, got %v", err)
+	}
+}
+
+func TestServeConn_UvarintFraming(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	// Queries over 127 bytes need a multi-byte length prefix both ways
+	long := strings.Repeat("q", 300)
+	send(t, conn,
+		request(t, map[string]interface{}{"model": "m", "query": long, "context": "c"}),
+		request(t, map[string]interface{}{"model": "m", "query": "short", "context": "c"}),
+	)
+
+	if resp := receive(t, r); resp.Result != long+"|c" || resp.Error != "" {
+		t.Errorf("first response: %+v", resp)
+	}
+	if resp := receive(t, r); resp.Result != "short|c" || resp.Error != "" {
+		t.Errorf("second response: %+v", resp)
+	}
+}
+
+func TestServeConn_RequestErrorKeepsConnectionOpen(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	send(t, conn,
+		request(t, map[string]interface{}{"query": "no model"}),
+		request(t, map[string]interface{}{"model": "m", "query": "after", "context": "c"}),
+	)
+
+	if resp := receive(t, r); resp.Error != "missing model in request payload" {
+		t.Errorf("expected a missing-model error, got %+v", resp)
+	}
+	if resp := receive(t, r); resp.Result != "after|c" {
+		t.Errorf("second response: %+v", resp)
+	}
+}
+
+func TestServeConn_ContextFramesInBatchEntryOrder(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	send(t, conn,
+		request(t, map[string]interface{}{
+			"model": "m",
+			"batch": []map[string]interface{}{
+				{"query": "a", "context_frame": true},
+				{"query": "b", "context": "inline"},
+				{"query": "c", "context_frame": true},
+			},
+		}),
+		[]byte("first raw context"),
+		[]byte("second raw context"),
+	)
+
+	resp := receive(t, r)
+	want := []string{"a|first raw context", "b|inline", "c|second raw context"}
+	if len(resp.Batch) != len(want) {
+		t.Fatalf("expected %d batch entries, got %+v", len(want), resp)
+	}
+	for i, entry := range resp.Batch {
+		if entry.Result != want[i] {
+			t.Errorf("entry %d: expected %q, got %v", i, want[i], entry.Result)
+		}
+	}
+}
+
+func TestServeConn_ClosesAfterUnparsableFrame(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	send(t, conn, []byte("{not json"))
+
+	if resp := receive(t, r); !strings.HasPrefix(resp.Error, "failed to parse input JSON") {
+		t.Errorf("expected a parse error, got %+v", resp)
+	}
+	expectClosed(t, r)
+}
+
+func TestServeConn_RejectsOversizedFrame(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	// Only the length prefix is sent; the daemon must not wait for the body
+	var prefix [binary.MaxVarintLen64]byte
+	n := binary.PutUvarint(prefix[:], maxFrameSize+1)
+	go conn.Write(prefix[:n])
+
+	expectClosed(t, r)
+}
+
+func TestReadFrame_SizeLimit(t *testing.T) {
+	var prefix [binary.MaxVarintLen64]byte
+	n := binary.PutUvarint(prefix[:], maxFrameSize+1)
+	_, err := readFrame(bufio.NewReader(strings.NewReader(string(prefix[:n]))))
+	if err == nil || !strings.Contains(err.Error(), "exceeds limit") {
+		t.Fatalf("expected a frame size error, got %v", err)
+	}
+}
+
+func TestServeConn_BatchEntryErrors(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	send(t, conn, request(t, map[string]interface{}{
+		"model": "m",
+		"batch": []map[string]interface{}{
+			{"query": "ok", "context": "1"},
+			{"query": "fail here", "context": "2"},
+			{"query": "ok again", "context": "3"},
+		},
+		"max_concurrency": 2,
+	}))
+
+	resp := receive(t, r)
+	if resp.Error != "" || resp.Result != "batch_complete" || len(resp.Batch) != 3 {
+		t.Fatalf("unexpected batch response: %+v", resp)
+	}
+	if resp.Batch[0].Result != "ok|1" || resp.Batch[0].Error != "" {
+		t.Errorf("entry 0: %+v", resp.Batch[0])
+	}
+	if resp.Batch[1].Error != "stub failure: fail here" {
+		t.Errorf("entry 1: expected its own error, got %+v", resp.Batch[1])
+	}
+	if resp.Batch[2].Result != "ok again|3" || resp.Batch[2].Error != "" {
+		t.Errorf("entry 2: %+v", resp.Batch[2])
+	}
+}
+
+func TestServeConn_StreamedBatch(t *testing.T) {
+	stubRunRequest(t)
+	conn, r := daemonConn(t)
+
+	send(t, conn,
+		request(t, map[string]interface{}{
+			"model":  "m",
+			"stream": true,
+			"batch": []map[string]interface{}{
+				{"query": "a", "context_frame": true},
+				{"query": "fail b", "context": "2"},
+				{"query": "c", "context": "3"},
+			},
+		}),
+		[]byte("raw"),
+		request(t, map[string]interface{}{"model": "m", "query": "next", "context": "c"}),
+	)
+
+	got := map[int]string{}
+	for i := 0; i < 3; i++ {
+		resp := receive(t, r)
+		if resp.Index == nil {
+			t.Fatalf("entry frame %d has no index: %+v", i, resp)
+		}
+		got[*resp.Index] = fmt.Sprint(resp.Result) + resp.Error
+	}
+	want := map[int]string{0: "a|raw", 1: "<nil>stub failure: fail b", 2: "c|3"}
+	for idx, w := range want {
+		if got[idx] != w {
+			t.Errorf("entry %d: expected %q, got %q", idx, w, got[idx])
+		}
+	}
+
+	if resp := receive(t, r); resp.Index != nil || resp.Result != "batch_complete" || len(resp.Batch) != 0 {
+		t.Errorf("expected a closing batch_complete frame, got %+v", resp)
+	}
+	if resp := receive(t, r); resp.Result != "next|c" {
+		t.Errorf("request after the stream: %+v", resp)
+	}
+}
@@ -10,13 +10,17 @@ import (
 )
 
 type requestPayload struct {
-	Model      string                 `json:"model"`
-	Query      string                 `json:"query"`
-	Context    string                 `json:"context"`
-	Config     map[string]interface{} `json:"config"`
-	Structured  *structuredRequest      `json:"structured,omitempty"`
-	LLMMap      *rlm.LLMMapConfig      `json:"llm_map,omitempty"`      // LCM LLM-Map operation
-	AgenticMap  *rlm.AgenticMapConfig  `json:"agentic_map,omitempty"`  // LCM Agentic-Map operation
+	Model          string                 `json:"model"`
+	Query          string                 `json:"query"`
+	Context        string                 `json:"context"`
+	Config         map[string]interface{} `json:"config"`
+	Structured     *structuredRequest     `json:"structured,omitempty"`
+	LLMMap         *rlm.LLMMapConfig      `json:"llm_map,omitempty"`         // LCM LLM-Map operation
+	AgenticMap     *rlm.AgenticMapConfig  `json:"agentic_map,omitempty"`     // LCM Agentic-Map operation
+	ContextFrame   bool                   `json:"context_frame,omitempty"`   // --daemon: context follows as a raw frame
+	Batch          []batchEntry           `json:"batch,omitempty"`           // Independent queries sharing model and config
+	MaxConcurrency int                    `json:"max_concurrency,omitempty"` // Batch entries run at once
+	Stream         bool                   `json:"stream,omitempty"`          // --daemon: one response frame per batch entry as it finishes
 }
 
 type structuredRequest struct {
@@ -26,16 +30,40 @@ type structuredRequest struct {
 }
 
 type responsePayload struct {
-	Result           interface{}        `json:"result"`
-	Stats            rlm.RLMStats       `json:"stats"`
-	StructuredResult bool               `json:"structured_result,omitempty"`
-	TraceEvents      interface{}        `json:"trace_events,omitempty"`
-	LCMStats          *rlm.LCMStoreStats    `json:"lcm_stats,omitempty"`
-	LLMMapResult      *rlm.LLMMapResult     `json:"llm_map_result,omitempty"`
-	AgenticMapResult  *rlm.AgenticMapResult  `json:"agentic_map_result,omitempty"`
+	Result           interface{}           `json:"result"`
+	Stats            rlm.RLMStats          `json:"stats"`
+	StructuredResult bool                  `json:"structured_result,omitempty"`
+	TraceEvents      interface{}           `json:"trace_events,omitempty"`
+	LCMStats         *rlm.LCMStoreStats    `json:"lcm_stats,omitempty"`
+	LLMMapResult     *rlm.LLMMapResult     `json:"llm_map_result,omitempty"`
+	AgenticMapResult *rlm.AgenticMapResult `json:"agentic_map_result,omitempty"`
+	Error            string                `json:"error,omitempty"`       // Set only in --server/--daemon mode or per batch entry
+	Batch            []*responsePayload    `json:"batch,omitempty"`       // Per-entry responses, in request order
+	DurationNs       int64                 `json:"duration_ns,omitempty"` // Set only per batch entry
+	Index            *int                  `json:"index,omitempty"`       // Batch entry position, set only when streaming
 }
 
 func main() {
+	if len(os.Args) > 1 && os.Args[1] == "--server" {
+		if err := serve(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintln(os.Stderr, err)
+			os.Exit(1)
+		}
+		return
+	}
+
+	if len(os.Args) > 1 && os.Args[1] == "--daemon" {
+		socketPath := defaultSocketPath
+		if len(os.Args) > 2 {
+			socketPath = os.Args[2]
+		}
+		if err := daemon(socketPath); err != nil {
+			fmt.Fprintln(os.Stderr, err)
+			os.Exit(1)
+		}
+		return
+	}
+
 	input, err := io.ReadAll(os.Stdin)
 	if err != nil {
 		fmt.Fprintln(os.Stderr, "Failed to read stdin:", err)
@@ -48,11 +76,66 @@ func main() {
 		os.Exit(1)
 	}
 
-	if req.Model == "" {
-		fmt.Fprintln(os.Stderr, "Missing model in request payload")
+	resp, err := handleRequest(req)
+	if err != nil {
+		fmt.Fprintln(os.Stderr, err)
 		os.Exit(1)
 	}
 
+	payload, err := json.Marshal(resp)
+	if err != nil {
+		fmt.Fprintln(os.Stderr, "Failed to encode response JSON:", err)
+		os.Exit(1)
+	}
+
+	fmt.Println(string(payload))
+}
+
+// serve runs the binary as a long-lived child process: it reads
+// newline-delimited JSON requests from r until EOF and writes exactly one
+// JSON response line per request to w. Request failures are reported in the
+// response's error field so the process stays up for the next request.
+func serve(r io.Reader, w io.Writer) error {
+	dec := json.NewDecoder(r)
+	enc := json.NewEncoder(w)
+	for {
+		var req requestPayload
+		if err := dec.Decode(&req); err != nil {
+			if err == io.EOF {
+				return nil
+			}
+			return fmt.Errorf("failed to parse input JSON: %w", err)
+		}
+
+		resp, err := handleRequest(req)
+		if err != nil {
+			resp = &responsePayload{Error: err.Error()}
+		}
+		if err := enc.Encode(resp); err != nil {
+			return fmt.Errorf("failed to encode response JSON: %w", err)
+		}
+	}
+}
+
+// handleRequest validates a request payload and runs it, or each of its
+// batch entries, through runRequest.
+func handleRequest(req requestPayload) (*responsePayload, error) {
+	if req.Model == "" {
+		return nil, fmt.Errorf("missing model in request payload")
+	}
+
+	if len(req.Batch) > 0 {
+		return handleBatch(req), nil
+	}
+
+	return runRequest(req)
+}
+
+// runRequest runs a single, non-batch request; tests replace it with a stub.
+var runRequest = runEngine
+
+// runEngine runs a single request payload against a fresh engine.
+func runEngine(req requestPayload) (*responsePayload, error) {
 	config := rlm.ConfigFromMap(req.Config)
 	engine := rlm.New(req.Model, config)
 	defer engine.Shutdown()
@@ -63,8 +146,7 @@ func main() {
 	if req.LLMMap != nil {
 		mapResult, err := engine.LLMMap(*req.LLMMap)
 		if err != nil {
-			fmt.Fprintln(os.Stderr, err)
-			os.Exit(1)
+			return nil, err
 		}
 		resp = responsePayload{
 			Result:       "llm_map_complete",
@@ -74,15 +156,14 @@ func main() {
 		// Handle Agentic-Map operation
 		agenticResult, err := engine.AgenticMap(*req.AgenticMap)
 		if err != nil {
-			fmt.Fprintln(os.Stderr, err)
-			os.Exit(1)
+			return nil, err
 		}
 		resp = responsePayload{
 			Result:           "agentic_map_complete",
 			AgenticMapResult: agenticResult,
 		}
 	} else if req.Structured != nil {
-	// Handle structured completion if requested
+		// Handle structured completion if requested
 		structuredConfig := &rlm.StructuredConfig{
 			Schema:            req.Structured.Schema,
 			ParallelExecution: req.Structured.ParallelExecution,
@@ -91,8 +172,7 @@ func main() {
 
 		result, stats, err := engine.StructuredCompletion(req.Query, req.Context, structuredConfig)
 		if err != nil {
-			fmt.Fprintln(os.Stderr, err)
-			os.Exit(1)
+			return nil, err
 		}
 
 		resp = responsePayload{
@@ -104,8 +184,7 @@ func main() {
 		// Regular completion
 		result, stats, err := engine.Completion(req.Query, req.Context)
 		if err != nil {
-			fmt.Fprintln(os.Stderr, err)
-			os.Exit(1)
+			return nil, err
 		}
 
 		resp = responsePayload{
@@ -129,11 +208,5 @@ func main() {
 		resp.LCMStats = &stats
 	}
 
-	payload, err := json.Marshal(resp)
-	if err != nil {
-		fmt.Fprintln(os.Stderr, "Failed to encode response JSON:", err)
-		os.Exit(1)
-	}
-
-	fmt.Println(string(payload))
+	return &resp, nil
 }
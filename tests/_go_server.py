@@ -0,0 +1,300 @@
+"""Go RLM child processes shared by the comparison scripts.
+
+The Go binary is started once per worker thread in ``--server`` mode and
+reused for every request, instead of paying a fork/exec per test case.
+Requests and responses are newline-delimited JSON over stdin/stdout,
+encoded with orjson when it is installed. ``get_client`` instead talks to
+a single ``--daemon`` process over a Unix socket, one connection per
+thread. ``run_once_async`` covers scripts that still invoke the binary once
+per request, without tying up a thread while it runs.
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    json_loads = json.loads
+
+GO_BINARY = "./go/rlm"
+
+
+class GoServer:
+    """A long-running ``rlm --server`` child speaking newline-delimited JSON."""
+
+    def __init__(self, binary: str = GO_BINARY):
+        self._proc = subprocess.Popen(
+            [binary, "--server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+
+    def call(self, payload: dict) -> dict:
+        """Send one request and block until its response line arrives."""
+        body = json_dumps(payload)
+        with self._lock:
+            # Separate writes: concatenating would copy the whole payload
+            self._proc.stdin.write(body)
+            self._proc.stdin.write(b"\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+
+        if not line:
+            raise Exception(f"Go RLM server exited with code {self._proc.poll()}")
+
+        response = json_loads(line)
+        if response.get("error"):
+            raise Exception(f"Go RLM failed: {response['error']}")
+        return response
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.terminate()
+
+
+async def run_once_async(binary: str, payload: dict, timeout: float) -> dict:
+    """Run the binary for a single request with ``asyncio.create_subprocess_exec``.
+
+    Waiting on the child yields to the event loop, so many one-shot runs can
+    be in flight from a single thread. The child is killed if the run times
+    out or the awaiting task is cancelled. The response is the last non-empty
+    stdout line; stderr goes to a temporary file so a chatty child can never
+    block on a full pipe.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        proc = await asyncio.create_subprocess_exec(
+            binary, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr,
+        )
+
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(json_dumps(payload)), timeout)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired([binary], timeout) from None
+        finally:
+            if proc.returncode is None:
+                # Timed out or cancelled: never leave the child running
+                proc.kill()
+                await proc.wait()
+
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise Exception(f"Go binary failed: {stderr.read().decode(errors='replace')}")
+
+    last = next((line for line in reversed(stdout.splitlines()) if line.strip()), b"")
+    return json_loads(last)
+
+
+def _uvarint(n: int) -> bytes:
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _read_uvarint(stream) -> int:
+    result = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise Exception("Go RLM daemon closed the connection")
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+class GoDaemon:
+    """An ``rlm --daemon`` child listening on a Unix socket in its own temporary directory."""
+
+    def __init__(self, binary: str = GO_BINARY, startup_timeout: float = 10):
+        self._dir = tempfile.mkdtemp(prefix="rlm-")
+        self.socket_path = os.path.join(self._dir, "daemon.sock")
+        self._proc = subprocess.Popen([binary, "--daemon", self.socket_path])
+
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if self._proc.poll() is not None:
+                raise Exception(f"Go RLM daemon exited with code {self._proc.returncode}")
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.socket_path)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    self.close()
+                    raise Exception(f"Go RLM daemon did not listen on {self.socket_path}")
+                time.sleep(0.05)
+
+    def running(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+class GoClient:
+    """A connection to a Go daemon exchanging uvarint length-prefixed JSON frames.
+
+    A request that fails partway, including a timeout, leaves the stream
+    mid-frame, so the connection is closed and ``get_client`` replaces it.
+    """
+
+    def __init__(self, socket_path: str, timeout: float):
+        self.closed = False
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+        self._rfile = self._sock.makefile("rb")
+
+    def settimeout(self, timeout: float):
+        """Bound how long any one send or receive of a later call may block."""
+        self._sock.settimeout(timeout)
+
+    def call(self, payload: dict) -> dict:
+        """Send one request frame and block until its response frame arrives."""
+        return self.call_bytes(json_dumps(payload))
+
+    def call_bytes(self, body: bytes, context_frames=()) -> dict:
+        """Like ``call`` for a request that is already JSON-encoded.
+
+        ``context_frames`` are raw UTF-8 contexts sent after the request, in
+        order, for the request or batch entries flagged ``context_frame``.
+        """
+        try:
+            self._send(body, context_frames)
+            response = self._receive()
+        except BaseException:
+            self.close()
+            raise
+        return _checked(response)
+
+    def call_stream(self, body: bytes, context_frames=()):
+        """Send a batch request flagged ``stream`` and yield each entry's response.
+
+        Entries arrive as they finish, not in request order; each carries its
+        ``index`` in the batch. Stopping early closes the connection.
+        """
+        complete = False
+        try:
+            self._send(body, context_frames)
+            while True:
+                response = self._receive()
+                if "index" not in response:
+                    complete = True
+                    break
+                yield response
+        finally:
+            if not complete:
+                self.close()
+        _checked(response)
+
+    def _send(self, body: bytes, context_frames):
+        for frame in (body, *context_frames):
+            # Separate sends: concatenating would copy the whole payload
+            self._sock.sendall(_uvarint(len(frame)))
+            self._sock.sendall(frame)
+
+    def _receive(self) -> dict:
+        size = _read_uvarint(self._rfile)
+        data = self._rfile.read(size)
+        if len(data) < size:
+            raise Exception("Go RLM daemon closed the connection")
+        return json_loads(data)
+
+    def close(self):
+        self.closed = True
+        self._rfile.close()
+        self._sock.close()
+
+
+def _checked(response: dict) -> dict:
+    if response.get("error"):
+        raise Exception(f"Go RLM failed: {response['error']}")
+    return response
+
+
+_local = threading.local()
+_servers = []
+_servers_lock = threading.Lock()
+_daemons = {}
+_clients = []
+
+
+def get_server() -> GoServer:
+    """Return the calling thread's Go server, starting it on first use."""
+    server = getattr(_local, "server", None)
+    if server is None:
+        server = GoServer()
+        _local.server = server
+        with _servers_lock:
+            _servers.append(server)
+    return server
+
+
+def get_client(binary: str = GO_BINARY, timeout: float = 300) -> GoClient:
+    """Return the calling thread's daemon connection, starting the daemon on first use.
+
+    ``timeout`` applies to the calls made on the returned client. A closed
+    connection is replaced, and an exited daemon restarted.
+    """
+    clients = _local.__dict__.setdefault("clients", {})
+    client = clients.get(binary)
+    if client is None or client.closed:
+        with _servers_lock:
+            if client in _clients:
+                _clients.remove(client)
+            daemon = _daemons.get(binary)
+            if daemon is None or not daemon.running():
+                if daemon is not None:
+                    daemon.close()
+                daemon = _daemons[binary] = GoDaemon(binary)
+            client = clients[binary] = GoClient(daemon.socket_path, timeout)
+            _clients.append(client)
+    client.settimeout(timeout)
+    return client
+
+
+@atexit.register
+def close_all():
+    """Close every connection and stop every child started by this process."""
+    with _servers_lock:
+        servers, clients, daemons = _servers[:], _clients[:], list(_daemons.values())
+        _servers.clear()
+        _clients.clear()
+        _daemons.clear()
+    for server in servers:
+        server.close()
+    for client in clients:
+        client.close()
+    for daemon in daemons:
+        daemon.close()
@@ -0,0 +1,130 @@
+"""On-disk LRU cache for RLM comparison runs.
+
+Wraps an implementation runner so identical (implementation, model, query,
+context, config) calls are answered from a local SQLite file instead of
+re-calling the LLM. The API key is never part of the key. Set
+``RLM_LLM_CACHE=off`` to bypass the cache, or to a path to relocate it.
+"""
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+try:
+    import orjson
+
+    def _canonical(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _canonical(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+CACHE_PATH = os.getenv("RLM_LLM_CACHE", str(Path(__file__).parent / ".llm_cache.sqlite"))
+MAX_ENTRIES = 1000
+
+# Keys over this size are hashed with BLAKE3's multithreaded tree mode
+PARALLEL_HASH_MIN = 1 << 20
+
+
+@contextlib.contextmanager
+def _connect():
+    conn = sqlite3.connect(CACHE_PATH, timeout=30)
+    try:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)"
+            )
+            yield conn
+    finally:
+        conn.close()
+
+
+def digest(data: bytes) -> str:
+    """BLAKE3 hex digest when blake3 is installed, else 256-bit BLAKE2b."""
+    if blake3 is None:
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+    if len(data) >= PARALLEL_HASH_MIN:
+        return blake3(data, max_threads=blake3.AUTO).hexdigest()
+    return blake3(data).hexdigest()
+
+
+def cache_key(impl: str, arguments: dict) -> str:
+    """Hash the canonicalized call, dropping API keys from any config dict."""
+    scrubbed = {
+        name: {k: v for k, v in value.items() if k != "api_key"} if isinstance(value, dict) else value
+        for name, value in arguments.items()
+    }
+    return digest(_canonical({"impl": impl, **scrubbed}))
+
+
+def lookup(key: str):
+    """Return the cached response for ``key`` and mark it recently used, or None."""
+    if CACHE_PATH == "off":
+        return None
+    with _connect() as conn:
+        row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        return _loads(row[0])
+
+
+def store(key: str, response: dict):
+    """Cache a response dict under ``key``; error responses are not stored."""
+    if CACHE_PATH == "off" or "error" in response:
+        return
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, accessed) VALUES (?, ?, ?)",
+            (key, _dumps(response), time.time()),
+        )
+        # Evict least recently used entries beyond the size bound
+        conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY accessed DESC LIMIT ?)",
+            (MAX_ENTRIES,),
+        )
+
+
+def cached(fn):
+    """Cache a runner's response dict on disk; error responses are not stored."""
+    if CACHE_PATH == "off":
+        return fn
+
+    signature = inspect.signature(fn)
+    impl = f"{fn.__module__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = cache_key(impl, bound.arguments)
+
+        response = lookup(key)
+        if response is None:
+            response = fn(*args, **kwargs)
+            store(key, response)
+        return response
+
+    return wrapper
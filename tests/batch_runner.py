@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Batched single-shot baseline for the RLM pattern test suite.
+
+Sends K independent test queries per LLM request and demultiplexes the
+answers by index, cutting request count (and RPM pressure) by ~K for the
+short-context categories. Chat models do not accept a list of prompts, so
+the K questions are numbered in one message and the model returns a JSON
+array of answers. Cases that need a full RLM session, and any chunk whose
+response cannot be demultiplexed, fall back to per-test RLM runs.
+"""
+
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+import litellm
+
+from test_rlm_patterns import MODEL, OPENAI_API_KEY, TEST_CASES, TestCase, run_python_test
+
+# Categories whose queries can be answered independently in one shot
+BATCHABLE_CATEGORIES = {"peeking", "grepping", "edge_cases"}
+
+BATCH_PROMPT = """Answer each of the following {n} independent questions using only its own context.
+Respond with ONLY a JSON array of {n} strings, where element i is the answer to question i.
+
+{questions}"""
+
+
+def _build_prompt(tests: List[TestCase]) -> str:
+    questions = "\n\n".join(
+        f"### Question {i}\nContext:\n{test.context}\n\nQuestion: {test.query}"
+        for i, test in enumerate(tests)
+    )
+    return BATCH_PROMPT.format(n=len(tests), questions=questions)
+
+
+def _run_chunk(tests: List[TestCase]) -> List[Dict[str, Any]]:
+    """Answer a chunk of tests with one request; fall back per-test on a bad response."""
+    start = time.perf_counter()
+    try:
+        response = litellm.completion(
+            model=MODEL,
+            api_key=OPENAI_API_KEY,
+            messages=[{"role": "user", "content": _build_prompt(tests)}],
+        )
+        content = response.choices[0].message.content.strip()
+        if content.startswith("```"):
+            content = content.strip("`").removeprefix("json").strip()
+        answers = json.loads(content)
+    except Exception as e:
+        print(f"  Batch of {len(tests)} failed ({e}); falling back to per-test runs")
+        return [run_python_test(test) for test in tests]
+
+    if not isinstance(answers, list) or len(answers) != len(tests):
+        print(f"  Batch of {len(tests)} returned a mismatched answer list; falling back to per-test runs")
+        return [run_python_test(test) for test in tests]
+
+    duration = time.perf_counter() - start
+    return [
+        {
+            "result": str(answer),
+            "stats": {"llm_calls": 1, "batch_size": len(tests)},
+            "duration": duration,
+        }
+        for answer in answers
+    ]
+
+
+def run_batch(tests: List[TestCase], k: int = 8) -> List[Dict[str, Any]]:
+    """Run tests, batching batchable ones k per request. Results follow input order."""
+    results: List[Dict[str, Any]] = [{} for _ in tests]
+
+    batchable = [i for i, t in enumerate(tests) if t.category in BATCHABLE_CATEGORIES]
+    for start in range(0, len(batchable), k):
+        indices = batchable[start:start + k]
+        for i, result in zip(indices, _run_chunk([tests[i] for i in indices])):
+            results[i] = result
+
+    for i, test in enumerate(tests):
+        if test.category not in BATCHABLE_CATEGORIES:
+            results[i] = run_python_test(test)
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the RLM pattern tests with batched LLM requests")
+    parser.add_argument("--k", type=int, default=8, help="Test queries per batched request")
+    args = parser.parse_args()
+
+    passed = 0
+    for test, result in zip(TEST_CASES, run_batch(TEST_CASES, k=args.k)):
+        if "error" in result:
+            print(f"❌ {test.name}: ERROR {result['error']}")
+            continue
+        valid, msg = test.validate(result["result"])
+        passed += valid
+        print(f"{'✅' if valid else '❌'} {test.name} ({test.category}) - {msg}")
+
+    print(f"\n{passed}/{len(TEST_CASES)} tests passed")
+    sys.exit(0 if passed == len(TEST_CASES) else 1)
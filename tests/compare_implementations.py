@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 """Compare Python and Go RLM implementations."""
 
-import json
 import os
-import subprocess
+import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the Python RLM to path
@@ -13,29 +15,82 @@ sys.path.insert(0, str(Path(__file__).parent / "recursive-llm" / "src"))
 
 from rlm import RLM
 
+from _compare_cache import CompareCache
+from _go_server import get_server
+from _llm_cache import cached
 
+# Fan-out limits: concurrent implementation runs (the executor's workers) and
+# run starts per minute. A run makes several LLM requests, so the latter only
+# paces runs; it does not cap the API's requests per minute.
+MAX_WORKERS = 8
+MAX_RUNS_PER_MINUTE = 60
+
+# Per-request LLM bounds so one hung call fails its test instead of stalling the suite
+LLM_TIMEOUT = 20
+LLM_MAX_RETRIES = 3
+LLM_MAX_TOKENS = 512
+
+_NUM_RE = re.compile(r'\d+')
+
+# Config keys consumed by RLM itself rather than forwarded to the LLM
+_EXCLUDED = frozenset({'recursive_model', 'api_base', 'api_key', 'max_depth', 'max_iterations'})
+
+
+class RunStartLimiter:
+    """Allow at most ``max_per_minute`` runs to start in any 60-second window.
+
+    Concurrency is bounded by the executor, not here. Each run issues an
+    unknown number of LLM requests, so this paces run starts only.
+    """
+
+    def __init__(self, max_per_minute: int):
+        self._lock = threading.Lock()
+        self._starts = deque()
+        self.max_per_minute = max_per_minute
+
+    def __enter__(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= 60:
+                    self._starts.popleft()
+                if len(self._starts) < self.max_per_minute:
+                    self._starts.append(now)
+                    return self
+                wait = 60 - (now - self._starts[0])
+            time.sleep(wait)
+
+    def __exit__(self, *exc):
+        return False
+
+
+def submit_all(executor: ThreadPoolExecutor, tests: list, limiter: RunStartLimiter, cache: CompareCache) -> dict:
+    """Submit the Python and Go runs of every test, keyed by test name."""
+    futures = {}
+    for test in tests:
+        kwargs = {k: test[k] for k in ("model", "query", "context", "config")}
+        futures[test["name"]] = (
+            executor.submit(cache.run, "python", test["name"], test_python_rlm, limiter=limiter, **kwargs),
+            executor.submit(cache.run, "go", test["name"], test_go_rlm, limiter=limiter, **kwargs),
+        )
+    return futures
+
+
+@cached
 def test_go_rlm(model: str, query: str, context: str, config: dict) -> dict:
     """Test Go RLM implementation."""
     payload = {
         "model": model,
         "query": query,
         "context": context,
-        "config": config,
+        # The Go client has no retry setting; unknown keys go to the API
+        "config": {"timeout": LLM_TIMEOUT, "max_tokens": LLM_MAX_TOKENS, **config},
     }
     
-    start_time = time.time()
-    result = subprocess.run(
-        ["./go/rlm"],
-        input=json.dumps(payload),
-        capture_output=True,
-        text=True,
-    )
-    duration = time.time() - start_time
-    
-    if result.returncode != 0:
-        raise Exception(f"Go RLM failed: {result.stderr}")
+    start_time = time.perf_counter()
+    response = get_server().call(payload)
+    duration = time.perf_counter() - start_time
     
-    response = json.loads(result.stdout)
     return {
         "result": response["result"],
         "stats": response["stats"],
@@ -43,6 +98,34 @@ def test_go_rlm(model: str, query: str, context: str, config: dict) -> dict:
     }
 
 
+_rlm_pool = threading.local()
+
+
+def _get_rlm(model, recursive_model, api_base, api_key, max_depth, max_iterations, kw_items) -> RLM:
+    """Return a reusable RLM for these settings with its stats reset.
+
+    Instances carry per-run stats, so the pool is per worker thread rather
+    than shared across concurrently running tests.
+    """
+    instances = _rlm_pool.__dict__.setdefault("instances", {})
+    key = (model, recursive_model, api_base, api_key, max_depth, max_iterations, kw_items)
+    rlm = instances.get(key)
+    if rlm is None:
+        rlm = instances[key] = RLM(
+            model=model,
+            recursive_model=recursive_model,
+            api_base=api_base,
+            api_key=api_key,
+            max_depth=max_depth,
+            max_iterations=max_iterations,
+            **dict(kw_items)
+        )
+    rlm._llm_calls = 0
+    rlm._iterations = 0
+    return rlm
+
+
+@cached
 def test_python_rlm(model: str, query: str, context: str, config: dict) -> dict:
     """Test Python RLM implementation."""
     # Extract config params
@@ -53,22 +136,24 @@ def test_python_rlm(model: str, query: str, context: str, config: dict) -> dict:
     max_iterations = config.get("max_iterations", 30)
     
     # Get extra params
-    excluded = {'recursive_model', 'api_base', 'api_key', 'max_depth', 'max_iterations'}
-    llm_kwargs = {k: v for k, v in config.items() if k not in excluded}
-    
-    rlm = RLM(
-        model=model,
-        recursive_model=recursive_model,
-        api_base=api_base,
-        api_key=api_key,
-        max_depth=max_depth,
-        max_iterations=max_iterations,
-        **llm_kwargs
+    llm_kwargs = {k: config[k] for k in config.keys() - _EXCLUDED}
+    llm_kwargs.setdefault("timeout", LLM_TIMEOUT)
+    llm_kwargs.setdefault("max_retries", LLM_MAX_RETRIES)
+    llm_kwargs.setdefault("max_tokens", LLM_MAX_TOKENS)
+    
+    rlm = _get_rlm(
+        model,
+        recursive_model,
+        api_base,
+        api_key,
+        max_depth,
+        max_iterations,
+        frozenset(llm_kwargs.items()),
     )
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     result = rlm.completion(query, context)
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
     return {
         "result": result,
@@ -79,57 +164,69 @@ def test_python_rlm(model: str, query: str, context: str, config: dict) -> dict:
 
 def compare_results(test_name: str, python_result: dict, go_result: dict):
     """Compare and display results from both implementations."""
-    print(f"\n{'='*60}")
-    print(f"Test: {test_name}")
-    print(f"{'='*60}")
+    lines = []
+    lines.append(f"\n{'='*60}")
+    lines.append(f"Test: {test_name}")
+    lines.append(f"{'='*60}")
     
-    print("\n📊 Results:")
-    print("-" * 60)
-    print(f"Python: {python_result['result'][:100]}...")
-    print(f"Go:     {go_result['result'][:100]}...")
+    lines.append("\n📊 Results:")
+    lines.append("-" * 60)
+    lines.append(f"Python: {python_result['result'][:100]}...")
+    lines.append(f"Go:     {go_result['result'][:100]}...")
     
-    print("\n📈 Stats:")
-    print("-" * 60)
-    print(f"{'Metric':<20} {'Python':<15} {'Go':<15} {'Diff':<10}")
-    print("-" * 60)
+    lines.append("\n📈 Stats:")
+    lines.append("-" * 60)
+    lines.append(f"{'Metric':<20} {'Python':<15} {'Go':<15} {'Diff':<10}")
+    lines.append("-" * 60)
     
     py_stats = python_result['stats']
     go_stats = go_result['stats']
     
-    print(f"{'LLM Calls':<20} {py_stats['llm_calls']:<15} {go_stats['llm_calls']:<15} {go_stats['llm_calls'] - py_stats['llm_calls']:<10}")
-    print(f"{'Iterations':<20} {py_stats['iterations']:<15} {go_stats['iterations']:<15} {go_stats['iterations'] - py_stats['iterations']:<10}")
-    print(f"{'Depth':<20} {py_stats['depth']:<15} {go_stats['depth']:<15} {go_stats['depth'] - py_stats['depth']:<10}")
-    print(f"{'Duration (s)':<20} {python_result['duration']:.2f}s{'':<10} {go_result['duration']:.2f}s{'':<10} {go_result['duration'] - python_result['duration']:.2f}s")
+    lines.append(f"{'LLM Calls':<20} {py_stats['llm_calls']:<15} {go_stats['llm_calls']:<15} {go_stats['llm_calls'] - py_stats['llm_calls']:<10}")
+    lines.append(f"{'Iterations':<20} {py_stats['iterations']:<15} {go_stats['iterations']:<15} {go_stats['iterations'] - py_stats['iterations']:<10}")
+    lines.append(f"{'Depth':<20} {py_stats['depth']:<15} {go_stats['depth']:<15} {go_stats['depth'] - py_stats['depth']:<10}")
+    lines.append(f"{'Duration (s)':<20} {python_result['duration']:.2f}s{'':<10} {go_result['duration']:.2f}s{'':<10} {go_result['duration'] - python_result['duration']:.2f}s")
     
     # Calculate speedup
     speedup = python_result['duration'] / go_result['duration']
-    print(f"\n⚡ Speedup: {speedup:.2f}x")
+    lines.append(f"\n⚡ Speedup: {speedup:.2f}x")
     
     # Check if results are semantically similar (basic check)
     py_lower = python_result['result'].lower().strip()
     go_lower = go_result['result'].lower().strip()
     
     # Extract numbers if present
-    import re
-    py_nums = set(re.findall(r'\d+', py_lower))
-    go_nums = set(re.findall(r'\d+', go_lower))
+    py_nums = set(_NUM_RE.findall(py_lower))
+    go_nums = set(_NUM_RE.findall(go_lower))
     
     if py_nums and go_nums:
         if py_nums == go_nums:
-            print("✅ Results contain same numbers - likely correct")
+            lines.append("✅ Results contain same numbers - likely correct")
         else:
-            print(f"⚠️  Different numbers: Python {py_nums}, Go {go_nums}")
+            lines.append(f"⚠️  Different numbers: Python {py_nums}, Go {go_nums}")
     else:
         # Simple similarity check
         common_words = len(set(py_lower.split()) & set(go_lower.split()))
         if common_words > 3:
-            print("✅ Results appear semantically similar")
+            lines.append("✅ Results appear semantically similar")
         else:
-            print("⚠️  Results may differ significantly")
+            lines.append("⚠️  Results may differ significantly")
+    
+    # One write per test keeps concurrent reports from interleaving
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     """Run comparison tests."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compare Python and Go RLM implementations")
+    parser.add_argument("--impl", choices=["python", "go", "both"], default="both",
+                        help="Implementation under test; the other side reuses its last stored results")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run the implementation under test even if its code is unchanged")
+    args = parser.parse_args()
+    
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("❌ OPENAI_API_KEY environment variable not set")
@@ -180,31 +277,25 @@ def main():
     
     results = []
     
-    for test in tests:
-        try:
-            print(f"\n🔄 Running test: {test['name']}")
-            print("  Testing Python implementation...")
-            py_result = test_python_rlm(
-                test["model"],
-                test["query"],
-                test["context"],
-                test["config"]
-            )
-            
-            print("  Testing Go implementation...")
-            go_result = test_go_rlm(
-                test["model"],
-                test["query"],
-                test["context"],
-                test["config"]
-            )
-            
-            compare_results(test["name"], py_result, go_result)
-            results.append((test["name"], True))
-            
-        except Exception as e:
-            print(f"❌ Test '{test['name']}' failed: {e}")
-            results.append((test["name"], False))
+    print(f"\n🔄 Running {len(tests)} tests (Python and Go) with {MAX_WORKERS} workers...")
+    limiter = RunStartLimiter(MAX_RUNS_PER_MINUTE)
+    selected = ("python", "go") if args.impl == "both" else (args.impl,)
+    cache = CompareCache(selected=selected, force=args.force)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        futures = submit_all(ex, tests, limiter, cache)
+        
+        # Report in declaration order regardless of completion order
+        for test in tests:
+            fpy, fgo = futures[test["name"]]
+            try:
+                py_result, go_result = fpy.result(), fgo.result()
+                compare_results(test["name"], py_result, go_result)
+                results.append((test["name"], True))
+                
+            except Exception as e:
+                print(f"❌ Test '{test['name']}' failed: {e}")
+                results.append((test["name"], False))
+    cache.save()
     
     # Summary
     print(f"\n\n{'='*60}")
@@ -3,18 +3,32 @@
 Compare normal vs metacognitive mode on test suite
 """
 
+import asyncio
 import os
 import sys
-import json
-import subprocess
+import time
+
+from _go_server import run_once_async
+from _llm_cache import cache_key, lookup, store
 
 # Load env
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-def run_test(category, use_metacognitive=False):
-    """Run test with specified mode"""
-    env = os.environ.copy()
+async def run_test(category, use_metacognitive=False):
+    """Run test with specified mode, reusing a cached response when there is one"""
+    input_data = build_input(use_metacognitive)
+    # The config dict's api_key is left out of the key
+    key = cache_key(f"{__name__}.run_test", input_data)
+    response = lookup(key)
+    if response is not None:
+        response["elapsed"] = 0.0
+        return response
     
+    response = await _run_test(input_data)
+    store(key, response)
+    return response
+
+def build_input(use_metacognitive):
     # Prepare input
     test_query = "How many lines contain questions (end with '?')?"
     test_context = """
@@ -27,7 +41,7 @@ def run_test(category, use_metacognitive=False):
         Final statement.
     """
     
-    input_data = {
+    return {
         "model": "gpt-4o-mini",
         "query": test_query,
         "context": test_context,
@@ -37,35 +51,31 @@ def run_test(category, use_metacognitive=False):
             "use_metacognitive": use_metacognitive
         }
     }
-    
-    import time
-    start_time = time.time()
-    
-    result = subprocess.run(
-        ["bin/rlm-go"],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True,
-        timeout=180  # 3 minutes for complex queries
-    )
-    
-    elapsed = time.time() - start_time
-    
-    if result.returncode != 0:
-        return {"error": result.stderr, "elapsed": elapsed}
+
+async def _run_test(input_data):
+    start_time = time.perf_counter()
     
     try:
-        output = json.loads(result.stdout)
-        output["elapsed"] = elapsed
-        return output
-    except json.JSONDecodeError as e:
-        return {"error": f"JSON decode error: {e}\nOutput: {result.stdout[:500]}", "elapsed": elapsed}
+        output = await run_once_async("bin/rlm-go", input_data, timeout=180)  # 3 minutes for complex queries
+    except Exception as e:
+        return {"error": str(e), "elapsed": time.perf_counter() - start_time}
+    
+    output["elapsed"] = time.perf_counter() - start_time
+    return output
 
 print("Testing Normal vs Metacognitive Mode")
 print("=" * 60)
 
-print("\n1. Testing NORMAL mode...")
-normal = run_test("test", use_metacognitive=False)
+async def run_both():
+    return await asyncio.gather(
+        run_test("test", use_metacognitive=False),
+        run_test("test", use_metacognitive=True),
+    )
+
+print("\nRunning NORMAL and METACOGNITIVE modes concurrently...")
+normal, meta = asyncio.run(run_both())
+
+print("\n1. NORMAL mode")
 if "error" in normal:
     print(f"   ❌ ERROR: {normal['error']}")
     print(f"   Elapsed: {normal.get('elapsed', 0):.2f}s")
@@ -74,8 +84,7 @@ else:
     print(f"   Stats: {normal.get('stats', {})}")
     print(f"   Elapsed: {normal.get('elapsed', 0):.2f}s")
 
-print("\n2. Testing METACOGNITIVE mode...")
-meta = run_test("test", use_metacognitive=True)
+print("\n2. METACOGNITIVE mode")
 if "error" in meta:
     print(f"   ❌ ERROR: {meta['error']}")
     print(f"   Elapsed: {meta.get('elapsed', 0):.2f}s")
@@ -1,20 +1,51 @@
 #!/usr/bin/env python3
 """Direct comparison: Python vs Go RLM implementations."""
 
+import asyncio
+import functools
 import sys
-import json
-import subprocess
+import threading
 import time
 import os
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "recursive-llm" / "src"))
 from rlm import RLM
+from _compare_cache import CompareCache, impl_hash
+from _go_server import get_server, json_dumps, json_loads
+from _llm_cache import cached, digest
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 if not API_KEY:
     raise ValueError("OPENAI_API_KEY environment variable is required")
 
+# Maximum implementation runs in flight at once
+MAX_CONCURRENCY = 8
+
+# Per-request LLM bounds so one hung call fails its test instead of stalling the suite
+LLM_TIMEOUT = 20
+LLM_MAX_RETRIES = 3
+LLM_MAX_TOKENS = 512
+
+# Shared by the long-document tests
+LONG_DOC_CONTEXT = """Section 1: Introduction
+This is the first section of our document. It contains important information about the topic.
+
+Section 2: Background
+The background section provides context and historical information needed to understand the main content.
+
+Section 3: Methodology  
+Here we describe the methods used in our research and analysis process.
+
+Section 4: Results
+This section presents the key findings from our analysis and research work.
+
+Section 5: Discussion
+We discuss the implications of our results and compare them with existing research.
+
+Section 6: Conclusion
+Finally, we summarize the main points and provide recommendations for future work."""
+
 # Test cases
 TESTS = [
     {
@@ -38,61 +69,61 @@ TESTS = [
     {
         "name": "Long Document - Count Sections",
         "query": "How many sections (paragraphs) are in this document?",
-        "context": """Section 1: Introduction
-This is the first section of our document. It contains important information about the topic.
-
-Section 2: Background
-The background section provides context and historical information needed to understand the main content.
-
-Section 3: Methodology  
-Here we describe the methods used in our research and analysis process.
-
-Section 4: Results
-This section presents the key findings from our analysis and research work.
-
-Section 5: Discussion
-We discuss the implications of our results and compare them with existing research.
-
-Section 6: Conclusion
-Finally, we summarize the main points and provide recommendations for future work.""",
+        "context": LONG_DOC_CONTEXT,
         "expected": "6"
     },
     {
         "name": "Long Document - Count Keywords",
         "query": "Count how many times the word 'section' appears (case insensitive)",
-        "context": """Section 1: Introduction
-This is the first section of our document. It contains important information about the topic.
+        "context": LONG_DOC_CONTEXT,
+        "expected": "11"  # "Section" appears 6 times, "section" appears 5 times = 11 total
+    }
+]
 
-Section 2: Background
-The background section provides context and historical information needed to understand the main content.
+# Opt-in semantic response cache (--semantic-cache). Only the query is
+# matched semantically: entries are scoped to the implementation, its code
+# hash and the exact context, so an answer is never reused for another
+# implementation, a changed implementation or a different document.
+_semantic_cache = None
+_semantic_lock = threading.Lock()
 
-Section 3: Methodology  
-Here we describe the methods used in our research and analysis process.
+@functools.lru_cache(maxsize=None)
+def _impl_hash(impl):
+    return impl_hash(impl)
 
-Section 4: Results
-This section presents the key findings from our analysis and research work.
+def _semantic_scope(impl, context):
+    return f"{impl}:{_impl_hash(impl)}:{digest(context.encode())}"
 
-Section 5: Discussion
-We discuss the implications of our results and compare them with existing research.
+def _semantic_get(impl, query, context):
+    """Return a stored result for a semantically equivalent query on the same context, if any."""
+    if _semantic_cache is None:
+        return None
+    with _semantic_lock:
+        hit, _similarity, _ = _semantic_cache.get(query, tenant_id=_semantic_scope(impl, context))
+    return json_loads(hit) if hit is not None else None
 
-Section 6: Conclusion
-Finally, we summarize the main points and provide recommendations for future work.""",
-        "expected": "11"  # "Section" appears 6 times, "section" appears 5 times = 11 total
-    }
-]
+def _semantic_set(impl, query, context, result):
+    if _semantic_cache is None:
+        return
+    with _semantic_lock:
+        _semantic_cache.set(query, json_dumps(result).decode(), tenant_id=_semantic_scope(impl, context))
 
+@cached
 def test_python(query, context):
     """Test Python implementation."""
-    rlm = RLM('gpt-4o-mini', api_key=API_KEY, max_iterations=15)
-    start = time.time()
+    rlm = RLM('gpt-4o-mini', api_key=API_KEY, max_iterations=15, timeout=LLM_TIMEOUT,
+              max_retries=LLM_MAX_RETRIES, max_tokens=LLM_MAX_TOKENS)
+    start = time.perf_counter()
     result = rlm.completion(query=query, context=context)
-    duration = time.time() - start
-    return {
+    duration = time.perf_counter() - start
+    response = {
         'result': result,
         'stats': rlm.stats,
         'duration': duration
     }
+    return response
 
+@cached
 def test_go(query, context):
     """Test Go implementation."""
     payload = {
@@ -101,75 +132,137 @@ def test_go(query, context):
         "context": context,
         "config": {
             "api_key": API_KEY,
-            "max_iterations": 15
+            "max_iterations": 15,
+            # The Go client has no retry setting; unknown keys go to the API
+            "timeout": LLM_TIMEOUT,
+            "max_tokens": LLM_MAX_TOKENS
         }
     }
     
-    start = time.time()
-    result = subprocess.run(
-        ["./go/rlm"],
-        input=json.dumps(payload),
-        capture_output=True,
-        text=True
-    )
-    duration = time.time() - start
-    
-    if result.returncode != 0:
-        raise Exception(f"Go failed: {result.stderr}")
+    start = time.perf_counter()
+    response = get_server().call(payload)
+    duration = time.perf_counter() - start
     
-    response = json.loads(result.stdout)
-    return {
+    result = {
         'result': response['result'],
         'stats': response['stats'],
         'duration': duration
     }
+    return result
+
+async def run_async(cache, impl, name, fn, query, context):
+    """Run a blocking implementation (or reuse its stored result) off the event loop.
+
+    A semantic cache hit is returned as-is and never written to the other caches.
+    The semantic cache is not consulted under --force, which refreshes its
+    entries instead, nor used at all when the implementation's code cannot be
+    hashed to scope its entries.
+    """
+    semantic = _semantic_cache is not None and _impl_hash(impl) is not None
+    if semantic and not cache.force:
+        hit = await asyncio.to_thread(_semantic_get, impl, query, context)
+        if hit is not None:
+            return hit
+    result = await asyncio.to_thread(cache.run, impl, name, fn, query=query, context=context)
+    if semantic:
+        await asyncio.to_thread(_semantic_set, impl, query, context, result)
+    return result
+
+async def run_all(tests, cache):
+    """Run both implementations for every test, bounded by MAX_CONCURRENCY.
+
+    Returns one ``(py_result, go_result)`` tuple or exception per test, in order.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def bounded(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(
+        *(
+            asyncio.gather(
+                bounded(run_async(cache, "python", test['name'], test_python,
+                                  query=test['query'], context=test['context'])),
+                bounded(run_async(cache, "go", test['name'], test_go,
+                                  query=test['query'], context=test['context'])),
+            )
+            for test in tests
+        ),
+        return_exceptions=True,
+    )
 
 def compare_results(name, expected, py_result, go_result):
     """Compare and display results."""
-    print(f"\n{'='*70}")
-    print(f"Test: {name}")
-    print(f"{'='*70}")
-    print(f"Expected: {expected}")
-    print(f"\nPython Result: {py_result['result']}")
-    print(f"Python Stats: LLM calls={py_result['stats']['llm_calls']}, "
-          f"Iterations={py_result['stats']['iterations']}, "
-          f"Time={py_result['duration']:.2f}s")
+    lines = []
+    lines.append(f"\n{'='*70}")
+    lines.append(f"Test: {name}")
+    lines.append(f"{'='*70}")
+    lines.append(f"Expected: {expected}")
+    lines.append(f"\nPython Result: {py_result['result']}")
+    lines.append(f"Python Stats: LLM calls={py_result['stats']['llm_calls']}, "
+                 f"Iterations={py_result['stats']['iterations']}, "
+                 f"Time={py_result['duration']:.2f}s")
     
-    print(f"\nGo Result:     {go_result['result']}")
-    print(f"Go Stats:     LLM calls={go_result['stats']['llm_calls']}, "
-          f"Iterations={go_result['stats']['iterations']}, "
-          f"Time={go_result['duration']:.2f}s")
+    lines.append(f"\nGo Result:     {go_result['result']}")
+    lines.append(f"Go Stats:     LLM calls={go_result['stats']['llm_calls']}, "
+                 f"Iterations={go_result['stats']['iterations']}, "
+                 f"Time={go_result['duration']:.2f}s")
     
     # Check accuracy
     py_correct = expected in str(py_result['result'])
     go_correct = expected in str(go_result['result'])
     
-    print(f"\n✓ Python: {'✅ CORRECT' if py_correct else '❌ INCORRECT'}")
-    print(f"✓ Go:     {'✅ CORRECT' if go_correct else '❌ INCORRECT'}")
+    lines.append(f"\n✓ Python: {'✅ CORRECT' if py_correct else '❌ INCORRECT'}")
+    lines.append(f"✓ Go:     {'✅ CORRECT' if go_correct else '❌ INCORRECT'}")
     
     # Performance comparison
     speedup = py_result['duration'] / go_result['duration']
-    print(f"\n⚡ Performance: Go is {speedup:.2f}x faster")
+    lines.append(f"\n⚡ Performance: Go is {speedup:.2f}x faster")
     
+    # One write per test keeps concurrent reports from interleaving
+    sys.stdout.write("\n".join(lines) + "\n")
     return py_correct and go_correct
 
 def main():
     """Run comparison tests."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compare Python and Go RLM implementations")
+    parser.add_argument("--impl", choices=["python", "go", "both"], default="both",
+                        help="Implementation under test; the other side reuses its last stored results")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run the implementation under test even if its code is unchanged")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Reuse results for semantically similar queries on the same context (requires sulci[sqlite])")
+    args = parser.parse_args()
+    
+    if args.semantic_cache:
+        global _semantic_cache
+        try:
+            from sulci import Cache
+        except ImportError:
+            print("❌ --semantic-cache requires sulci: pip install 'sulci[sqlite]'")
+            return 1
+        _semantic_cache = Cache(backend="sqlite", threshold=0.9)
+    
     print("🔬 RLM Comparison: Python vs Go")
     print("="*70)
     
     results = []
     
-    for test in TESTS:
+    print(f"\n🔄 Running {len(TESTS)} tests (up to {MAX_CONCURRENCY} runs in flight)...")
+    selected = ("python", "go") if args.impl == "both" else (args.impl,)
+    cache = CompareCache(selected=selected, force=args.force)
+    outcomes = asyncio.run(run_all(TESTS, cache))
+    cache.save()
+    
+    for test, outcome in zip(TESTS, outcomes):
         try:
-            print(f"\n🔄 Running: {test['name']}...")
-            
-            print("  Testing Python...")
-            py_result = test_python(test['query'], test['context'])
-            
-            print("  Testing Go...")
-            go_result = test_go(test['query'], test['context'])
+            if isinstance(outcome, Exception):
+                raise outcome
             
+            py_result, go_result = outcome
             passed = compare_results(
                 test['name'],
                 test['expected'],
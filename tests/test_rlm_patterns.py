@@ -13,17 +13,36 @@ Tests both Python and Go implementations for parity across all key RLM patterns:
 7. Edge cases - Empty context, malformed data, large numbers
 """
 
+import asyncio
+import atexit
+import functools
+import logging
 import os
 import sys
 import json
-import subprocess
+import multiprocessing
+import queue
+import shutil
+import threading
 import time
-from typing import Dict, Any, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 # Add recursive-llm to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'recursive-llm', 'src'))
 
+from _compare_cache import impl_hash
+from _go_server import close_all, get_client, json_dumps
+from _llm_cache import cache_key, digest, lookup, store
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from rlm import RLM
     PYTHON_AVAILABLE = True
@@ -34,19 +53,41 @@ except ImportError:
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = "gpt-4o-mini"
+MAX_ITERATIONS = 30
 GO_BINARY = os.path.join(os.path.dirname(__file__), "bin", "rlm-go")
 
+# Model and config are the same for every Go request: encode them once, minus
+# the closing brace, and splice each request's own fields in after them
+_GO_REQUEST_BASE = json_dumps({
+    "model": MODEL,
+    "config": {
+        "api_key": OPENAI_API_KEY,
+        "max_iterations": MAX_ITERATIONS
+    }
+})[:-1]
+
+def _go_request(**fields) -> bytes:
+    return _GO_REQUEST_BASE + b"," + json_dumps(fields)[1:]
+
 class TestCase:
     def __init__(self, name: str, category: str, query: str, context: str, 
-                 validator=None, expected_contains=None, expected_exact=None):
+                 validator=None, expected_contains=None, expected_exact=None,
+                 expected_all_substrings=None, expected_absent=None):
         self.name = name
         self.category = category
         self.query = query
         self.context = context
+        self.context_length = len(context)
         self.validator = validator
         self.expected_contains = expected_contains or []
         self.expected_exact = expected_exact
         
+        # Required and forbidden substrings, lowered once here; the result is
+        # lowered once per validation. Each needle is checked on its own so
+        # overlapping needles are all found.
+        self._required = sorted({s.lower() for s in expected_all_substrings or []})
+        self._absent = sorted({s.lower() for s in expected_absent or []})
+        
     def validate(self, result: str) -> Tuple[bool, str]:
         """Validate result against expectations"""
         if self.validator:
@@ -63,12 +104,26 @@ class TestCase:
                     return False, f"Missing expected content: '{expected}'"
             return True, "All expected content found"
         
+        if self._required or self._absent:
+            lowered = result.lower()
+            missing = [needle for needle in self._required if needle not in lowered]
+            if missing:
+                return False, f"Missing expected content: {missing}"
+            present = [needle for needle in self._absent if needle in lowered]
+            if present:
+                return False, f"Unexpected content: {present}"
+            return True, "All expected content found"
+        
         return True, "No validation rules"
 
 # ============================================================================
 # TEST CASES - Based on RLM Paper Patterns
 # ============================================================================
 
+# Needle-in-a-haystack context: 1000 filler lines with the secret on line 500
+_FMT = "Random filler text line number {} with various words.".format
+_NEEDLE_CTX = "\n".join(map(_FMT, range(1000))).replace(_FMT(500), "The secret code is: ALPHA-BRAVO-CHARLIE")
+
 TEST_CASES = [
     # CATEGORY 1: PEEKING (Paper section on "Peeking")
     # LM should peek at first part of context to understand structure
@@ -105,12 +160,7 @@ TEST_CASES = [
         Mary: mary@test.org
         Bob: bob@company.net
         """,
-        validator=lambda r: (
-            ("john@example.com" in r.lower() and 
-             "mary@test.org" in r.lower() and 
-             "bob@company.net" in r.lower()),
-            "Should find all 3 emails"
-        )
+        expected_all_substrings=["john@example.com", "mary@test.org", "bob@company.net"]
     ),
     
     TestCase(
@@ -140,10 +190,7 @@ TEST_CASES = [
         No ID here
         Record ID-9012: Final record
         """,
-        validator=lambda r: (
-            ("1234" in r and "5678" in r and "9012" in r),
-            "Should find all 3 IDs"
-        )
+        expected_all_substrings=["1234", "5678", "9012"]
     ),
     
     # CATEGORY 3: PARTITION + MAP (Paper section on "Partition + Map")
@@ -235,11 +282,9 @@ Commit 3 - Remove milk:
 Commit 4 - Add butter:
 +butter
         """,
-        validator=lambda r: (
-            ("oranges" in r.lower() and "cheese" in r.lower() and 
-             "butter" in r.lower() and "milk" not in r.lower()),
-            "Final list should have oranges, bread, eggs, coffee, cheese, butter (no milk, no apples)"
-        )
+        # Final list: oranges, bread, eggs, coffee, cheese, butter (no milk)
+        expected_all_substrings=["oranges", "cheese", "butter"],
+        expected_absent=["milk"]
     ),
     
     TestCase(
@@ -335,11 +380,7 @@ Commit 4 - Add butter:
         name="context_rot_needle",
         category="context_rot",
         query="What is the secret code?",
-        context="\n".join([
-            "Random filler text line number " + str(i) + " with various words."
-            if i != 500 else "The secret code is: ALPHA-BRAVO-CHARLIE"
-            for i in range(1000)
-        ]),
+        context=_NEEDLE_CTX,
         expected_contains=["ALPHA-BRAVO-CHARLIE"]
     ),
     
@@ -352,81 +393,473 @@ Commit 4 - Add butter:
     ),
 ]
 
+# Indexes for the command-line filters
+TEST_BY_NAME: Dict[str, TestCase] = {t.name: t for t in TEST_CASES}
+TESTS_BY_CATEGORY: Dict[str, List[TestCase]] = defaultdict(list)
+for _test in TEST_CASES:
+    TESTS_BY_CATEGORY[_test.category].append(_test)
+
 # ============================================================================
 # TEST RUNNERS
 # ============================================================================
 
-def run_python_test(test: TestCase) -> Dict[str, Any]:
-    """Run test with Python RLM implementation"""
+# Response cache (tests/_llm_cache.py) for unchanged (implementation version,
+# model, config, query, context); --no-cache disables it, --refresh-cache
+# re-runs and overwrites
+USE_CACHE = True
+REFRESH_CACHE = False
+
+@functools.lru_cache(maxsize=None)
+def _impl_version(impl: str) -> str:
+    """Identify the code under test: the Go binary's digest, or the imported rlm package's hash
+    
+    None when it cannot be found; responses are then neither cached nor replayed.
+    """
+    return impl_hash(impl, GO_BINARY)
+
+def _response_key(impl: str, test: TestCase) -> str:
+    return cache_key(f"test_rlm_patterns.{impl}", {
+        "version": _impl_version(impl),
+        "model": MODEL,
+        "max_iterations": MAX_ITERATIONS,
+        "query": test.query,
+        "context": test.context
+    })
+
+def _cached_response(impl: str, test: TestCase) -> Dict[str, Any]:
+    """Return the stored result for this test, with no time spent, or None"""
+    if not USE_CACHE or REFRESH_CACHE or _impl_version(impl) is None:
+        return None
+    response = lookup(_response_key(impl, test))
+    if response is not None:
+        response["duration"] = 0.0
+        response["stats"] = {**response.get("stats", {}), "duration_ns": 0}
+    return response
+
+def _cache_response(impl: str, test: TestCase, response: Dict[str, Any]):
+    if USE_CACHE and _impl_version(impl) is not None:
+        store(_response_key(impl, test), response)
+
+# Idle RLM instances, reused across tests. A run holds its instance exclusively
+# because instances keep per-run call and iteration counters.
+_idle_rlms = []
+
+def _acquire_rlm() -> "RLM":
+    """Return an idle RLM with its stats reset, or a new one if none is idle"""
+    try:
+        rlm = _idle_rlms.pop()
+    except IndexError:
+        return RLM(model=MODEL, api_key=OPENAI_API_KEY, max_iterations=MAX_ITERATIONS)
+    rlm._llm_calls = 0
+    rlm._iterations = 0
+    return rlm
+
+async def run_python_test_async(test: TestCase) -> Dict[str, Any]:
+    """Run test with Python RLM implementation without blocking the event loop"""
     if not PYTHON_AVAILABLE:
         return {"error": "Python RLM not available"}
     
+    response = _cached_response("python", test)
+    if response is None:
+        response = await _run_python(test)
+        _cache_response("python", test, response)
+    return response
+
+async def _run_python(test: TestCase) -> Dict[str, Any]:
+    rlm = None
     try:
-        rlm = RLM(model=MODEL, api_key=OPENAI_API_KEY, max_iterations=30)
-        start = time.time()
-        result = rlm.completion(query=test.query, context=test.context)
-        duration = time.time() - start
+        rlm = _acquire_rlm()
+        start = time.perf_counter_ns()
+        result = await rlm.acompletion(query=test.query, context=test.context)
+        duration_ns = time.perf_counter_ns() - start
         
         # Handle both dict and string results
         if isinstance(result, str):
             return {
                 "result": result,
-                "stats": {},
-                "duration": duration
+                "stats": {"duration_ns": duration_ns},
+                "duration": duration_ns / 1e9
             }
         
         return {
             "result": result.get("result", result.get("answer", "")),
-            "stats": result.get("stats", {}),
-            "duration": duration
+            "stats": {**result.get("stats", {}), "duration_ns": duration_ns},
+            "duration": duration_ns / 1e9
         }
     except Exception as e:
         return {"error": str(e)}
+    finally:
+        if rlm is not None:
+            _idle_rlms.append(rlm)
+
+def run_python_test(test: TestCase) -> Dict[str, Any]:
+    """Run test with Python RLM implementation"""
+    return asyncio.run(run_python_test_async(test))
+
+def start_python_tests(tests: List[TestCase], concurrency: int = 8) -> List[Future]:
+    """Start Python runs for tests on one background event loop, up to `concurrency` at a time
+    
+    Returns one future per test, in input order, each resolved as its run finishes.
+    """
+    futures = [Future() for _ in tests]
+    
+    async def run_all():
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def run(test, future):
+            async with sem:
+                try:
+                    future.set_result(await run_python_test_async(test))
+                except Exception as e:
+                    # e.g. a cache error; the collector must not wait forever
+                    future.set_exception(e)
+        
+        await asyncio.gather(*map(run, tests, futures))
+    
+    threading.Thread(target=asyncio.run, args=(run_all(),), daemon=True).start()
+    return futures
 
 def run_go_test(test: TestCase) -> Dict[str, Any]:
     """Run test with Go RLM implementation"""
+    response = _cached_response("go", test)
+    if response is None:
+        response = _run_go(test)
+        _cache_response("go", test, response)
+    return response
+
+def _run_go(test: TestCase) -> Dict[str, Any]:
     if not os.path.exists(GO_BINARY):
         return {"error": f"Go binary not found at {GO_BINARY}"}
     
     try:
-        input_data = {
-            "model": MODEL,
-            "query": test.query,
-            "context": test.context,
-            "config": {
-                "api_key": OPENAI_API_KEY,
-                "max_iterations": 30
-            }
-        }
-        
-        start = time.time()
-        result = subprocess.run(
-            [GO_BINARY],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minutes for complex/long queries
-        )
-        duration = time.time() - start
+        # The context travels as a raw frame after the request, not as JSON
+        input_data = _go_request(query=test.query, context_frame=True)
         
-        if result.returncode != 0:
-            return {"error": f"Go binary failed: {result.stderr}"}
+        # Daemon startup on first use is not part of the test's time
+        client = get_client(GO_BINARY, timeout=300)  # 5 minutes for complex/long queries
+        start = time.perf_counter_ns()
+        output = client.call_bytes(input_data, [test.context.encode()])
+        duration_ns = time.perf_counter_ns() - start
         
-        output = json.loads(result.stdout)
         return {
             "result": output.get("result", ""),
-            "stats": output.get("stats", {}),
-            "duration": duration
+            "stats": {**output.get("stats", {}), "duration_ns": duration_ns},
+            "duration": duration_ns / 1e9
         }
     except Exception as e:
         return {"error": str(e)}
 
+def start_go_batch(tests: List[TestCase], concurrency: int = 8) -> List[Future]:
+    """Start Go runs for tests as one streamed batch request, up to `concurrency` at a time
+    
+    Returns one future per test, in input order, each resolved as its entry's
+    response arrives. Cached tests resolve at once and are left out of the batch.
+    """
+    futures = [Future() for _ in tests]
+    misses = []
+    for test, future in zip(tests, futures):
+        response = _cached_response("go", test)
+        if response is None:
+            misses.append((test, future))
+        else:
+            future.set_result(response)
+    
+    if misses:
+        threading.Thread(target=_run_go_batch, args=(misses, concurrency), daemon=True).start()
+    return futures
+
+def _run_go_batch(misses: List[Tuple[TestCase, Future]], concurrency: int):
+    try:
+        if not os.path.exists(GO_BINARY):
+            raise Exception(f"Go binary not found at {GO_BINARY}")
+        
+        # Contexts travel as raw frames after the request, not as JSON
+        input_data = _go_request(
+            batch=[{"query": test.query, "context_frame": True} for test, _ in misses],
+            max_concurrency=concurrency,
+            stream=True
+        )
+        
+        client = get_client(GO_BINARY, timeout=300)  # 5 minutes between entry responses
+        for entry in client.call_stream(input_data, [test.context.encode() for test, _ in misses]):
+            test, future = misses[entry["index"]]
+            response = {"error": entry["error"]} if entry.get("error") else {
+                "result": entry.get("result", ""),
+                "stats": {**entry.get("stats", {}), "duration_ns": entry.get("duration_ns", 0)},
+                "duration": entry.get("duration_ns", 0) / 1e9
+            }
+            _cache_response("go", test, response)
+            future.set_result(response)
+    except Exception as e:
+        for _, future in misses:
+            if not future.done():
+                future.set_result({"error": str(e)})
+
 # ============================================================================
 # MAIN TEST EXECUTION
 # ============================================================================
 
-def run_all_tests(impl: str = "both"):
-    """Run all tests for specified implementation(s)"""
+# Progress output goes through a queue drained by one listener thread, so
+# test workers never block on terminal writes
+log = logging.getLogger("rlm_patterns")
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def _flush_log():
+    """Block until every queued progress record has been written"""
+    _log_listener.stop()
+    _log_listener.start()
+
+# Validators run here as soon as each result arrives, so a test's collector
+# thread is never validating one result while another is still pending
+_validate_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="validate")
+
+def _start_validation(test: TestCase, run_result: Dict[str, Any]) -> Future:
+    """Submit validation of a run's result; None for a failed run"""
+    if "error" in run_result:
+        return None
+    return _validate_pool.submit(test.validate, run_result["result"])
+
+def _record(label: str, run_result: Dict[str, Any], validation: Future, lines: List[str],
+            verbose: bool = False) -> Dict[str, Any]:
+    """Await one implementation's validation, append its report lines and return its entry"""
+    if "error" in run_result:
+        lines.append(f"  {label}: ❌ ERROR: {run_result['error']}")
+        return {"error": run_result["error"]}
+    
+    valid, msg = validation.result()
+    status = "✅" if valid else "❌"
+    lines.append(f"  {label}: {status} {run_result['duration']:.2f}s - {msg}")
+    if verbose:
+        lines.append(f"    Result: {run_result['result'][:100]}")
+        lines.append(f"    Stats: {run_result['stats']}")
+    
+    return {
+        "result": run_result["result"],
+        "stats": run_result["stats"],
+        "duration": run_result["duration"],
+        "valid": valid,
+        "validation_message": msg
+    }
+
+def _run_one(i: int, test: TestCase, total: int, py_future: Future = None, go_future: Future = None,
+             verbose: bool = False) -> Dict[str, Any]:
+    """Collect one test's in-flight run(s) and print its report as one block
+    
+    `py_future` and `go_future` resolve to this test's Python and Go results;
+    either is None when that implementation is not run.
+    Query, context size, result and stats lines are only reported when `verbose`.
+    """
+    lines = [f"\n[{i}/{total}] {test.name} ({test.category})"]
+    if verbose:
+        lines.append(f"Query: {test.query[:80]}...")
+        lines.append(f"Context: {test.context_length} chars")
+    
+    test_result = {
+        "name": test.name,
+        "category": test.category,
+        "query": test.query,
+        "context_length": test.context_length
+    }
+    
+    if py_future is not None:
+        py_run = py_future.result()
+        py_validation = _start_validation(test, py_run)
+    
+    if go_future is not None:
+        go_run = go_future.result()
+        go_validation = _start_validation(test, go_run)
+    
+    if py_future is not None:
+        test_result["python"] = _record("Python", py_run, py_validation, lines, verbose)
+    
+    if go_future is not None:
+        test_result["go"] = _record("Go", go_run, go_validation, lines, verbose)
+    
+    # Compare results if both ran
+    if "python" in test_result and "go" in test_result:
+        if "error" not in test_result["python"] and "error" not in test_result["go"]:
+            py_valid = test_result["python"]["valid"]
+            go_valid = test_result["go"]["valid"]
+            
+            if py_valid and go_valid:
+                test_result["parity"] = "✅ BOTH PASS"
+            elif not py_valid and not go_valid:
+                test_result["parity"] = "⚠️  BOTH FAIL"
+            elif py_valid:
+                test_result["parity"] = "❌ PYTHON ONLY"
+            else:
+                test_result["parity"] = "❌ GO ONLY"
+            
+            lines.append(f"  Parity: {test_result['parity']}")
+    
+    log.info("\n".join(lines))
+    return test_result
+
+def _summary_entry(test_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a full test result to the fields the category summary needs"""
+    return {
+        "name": test_result["name"],
+        "category": test_result["category"],
+        "py_valid": test_result.get("python", {}).get("valid"),
+        "go_valid": test_result.get("go", {}).get("valid")
+    }
+
+# Results longer than this are stored truncated, with the full body in a
+# sidecar file named by its digest, unless --store-full-results is given
+STORE_FULL_RESULTS = False
+STORED_RESULT_CHARS = 512
+
+def _compact(test_result: Dict[str, Any], bodies_dir: str) -> Dict[str, Any]:
+    """Truncate long result bodies for storage, writing each unique full body to `bodies_dir` once"""
+    for impl in ("python", "go"):
+        entry = test_result.get(impl)
+        if not entry or not isinstance(entry.get("result"), str) or len(entry["result"]) <= STORED_RESULT_CHARS:
+            continue
+        body = entry["result"].encode()
+        sha = digest(body)
+        os.makedirs(bodies_dir, exist_ok=True)
+        try:
+            with open(os.path.join(bodies_dir, f"{sha}.txt"), 'xb') as f:
+                f.write(body)
+        except FileExistsError:
+            pass
+        test_result[impl] = {**entry, "result": entry["result"][:STORED_RESULT_CHARS], "result_sha": sha}
+    return test_result
+
+def _dump_line(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record).encode() + b"\n"
+
+def _load_recorded(path: str) -> List[Dict[str, Any]]:
+    """Read back the summary entries of tests already completed in a results file
+    
+    A test whose latest record carries an error is left out, so resuming
+    re-runs it. A final line cut short by an interrupted run is dropped from
+    the file, so appended results start on a line of their own.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    records = {}
+    with open(path, 'rb+') as f:
+        lines = f.readlines()
+        end = 0
+        for n, line in enumerate(lines):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated line")
+                record = loads(line) if line.strip() else {}
+            except ValueError:
+                if n < len(lines) - 1:
+                    raise
+                f.truncate(end)
+                break
+            end += len(line)
+            if "name" in record:
+                records[record["name"]] = record
+    return [
+        _summary_entry(record) for record in records.values()
+        if not any("error" in record.get(impl, {}) for impl in ("python", "go"))
+    ]
+
+def _recorded_impl(path: str) -> str:
+    """Return the implementation a results file was written for, from its header line"""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, 'rb') as f:
+        try:
+            return loads(f.readline()).get("impl")
+        except ValueError:
+            return None
+
+def _run_tests(tests: List[TestCase], impl: str, concurrency: int, out, verbose: bool) -> List[Dict[str, Any]]:
+    """Run tests, appending each full result to `out` as it finishes; return their summary entries in order"""
+    # Tests are network-bound, so run them concurrently; keep declaration order in the summary.
+    # Python runs share one event loop and the whole Go side goes out as one streamed batch request.
+    py_futures = [None] * len(tests)
+    if tests and impl in ["python", "both"] and PYTHON_AVAILABLE:
+        py_futures = start_python_tests(tests, concurrency)
+    
+    go_futures = [None] * len(tests)
+    if tests and impl in ["go", "both"]:
+        go_futures = start_go_batch(tests, concurrency)
+    
+    bodies_dir = os.path.join(os.path.dirname(out.name), "results_bodies")
+    by_index = {}
+    # One collector per test, so each result is written as soon as its runs
+    # finish, whatever order they finish in
+    with ThreadPoolExecutor(max_workers=max(len(tests), 1)) as pool:
+        futures = {
+            pool.submit(_run_one, i, test, len(tests), py_future, go_future, verbose): i
+            for i, (test, py_future, go_future) in enumerate(zip(tests, py_futures, go_futures), 1)
+        }
+        for future in as_completed(futures):
+            test_result = future.result()
+            if not STORE_FULL_RESULTS:
+                test_result = _compact(test_result, bodies_dir)
+            out.write(_dump_line(test_result))
+            out.flush()
+            by_index[futures[future]] = _summary_entry(test_result)
+    return [by_index[i] for i in sorted(by_index)]
+
+def _run_shard(names: List[str], impl: str, concurrency: int, verbose: bool,
+               use_cache: bool, refresh_cache: bool, store_full_results: bool, path: str) -> List[Dict[str, Any]]:
+    """Run one shard of tests in a worker process, streaming its results to `path`"""
+    global USE_CACHE, REFRESH_CACHE, STORE_FULL_RESULTS
+    USE_CACHE, REFRESH_CACHE, STORE_FULL_RESULTS = use_cache, refresh_cache, store_full_results
+    try:
+        with open(path, 'wb') as out:
+            summary = _run_tests([TEST_BY_NAME[name] for name in names], impl, concurrency, out, verbose)
+    finally:
+        # The pool may terminate this worker as soon as the result is returned,
+        # skipping atexit handlers, so stop its daemon and flush output now
+        close_all()
+        _flush_log()
+    return summary
+
+def _run_sharded(tests: List[TestCase], impl: str, concurrency: int, out, verbose: bool,
+                 processes: int) -> List[Dict[str, Any]]:
+    """Split tests round-robin across worker processes, each running `concurrency` tests at a time
+    
+    Each worker streams to its own shard file; the shards are appended to
+    `out` in order once every worker has finished.
+    """
+    shards = [shard for shard in (tests[k::processes] for k in range(processes)) if shard]
+    paths = [f"{out.name}.shard{k}" for k in range(len(shards))]
+    
+    _flush_log()  # Keep our own output ahead of the workers'
+    
+    # forkserver workers start from a clean, already-imported server process
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with multiprocessing.get_context(method).Pool(len(shards)) as workers:
+        summaries = workers.starmap(_run_shard, [
+            ([t.name for t in shard], impl, concurrency, verbose, USE_CACHE, REFRESH_CACHE, STORE_FULL_RESULTS, path)
+            for shard, path in zip(shards, paths)
+        ])
+    
+    for path in paths:
+        with open(path, 'rb') as shard_file:
+            shutil.copyfileobj(shard_file, out)
+        os.remove(path)
+    out.flush()
+    
+    order = {test.name: i for i, test in enumerate(tests)}
+    return sorted((entry for summary in summaries for entry in summary), key=lambda entry: order[entry["name"]])
+
+def run_all_tests(impl: str = "both", concurrency: int = 8, resume: str = None, verbose: bool = False,
+                  processes: int = 1):
+    """Run all tests for specified implementation(s), up to `concurrency` at a time
+    
+    Each test's full result is appended to a JSON Lines file as soon as it
+    finishes; only a small summary entry per test is kept in memory. With
+    `resume`, tests already recorded in that file without an error are
+    skipped and new results are appended to it. With `processes` > 1 the tests are sharded
+    across that many worker processes.
+    """
     
     results = {
         "timestamp": datetime.now().isoformat(),
@@ -434,120 +867,53 @@ def run_all_tests(impl: str = "both"):
         "tests": []
     }
     
-    print(f"\n{'='*80}")
-    print(f"RLM PATTERN-BASED TEST SUITE")
-    print(f"Based on: https://alexzhang13.github.io/blog/2025/rlm/")
-    print(f"{'='*80}\n")
-    
-    for i, test in enumerate(TEST_CASES, 1):
-        print(f"\n[{i}/{len(TEST_CASES)}] {test.name} ({test.category})")
-        print(f"Query: {test.query[:80]}...")
-        print(f"Context: {len(test.context)} chars")
-        
-        test_result = {
-            "name": test.name,
-            "category": test.category,
-            "query": test.query,
-            "context_length": len(test.context)
-        }
-        
-        # Run Python test
-        if impl in ["python", "both"] and PYTHON_AVAILABLE:
-            print("  Running Python...", end=" ", flush=True)
-            py_result = run_python_test(test)
-            
-            if "error" in py_result:
-                print(f"❌ ERROR: {py_result['error']}")
-                test_result["python"] = {"error": py_result["error"]}
-            else:
-                valid, msg = test.validate(py_result["result"])
-                status = "✅" if valid else "❌"
-                print(f"{status} {py_result['duration']:.2f}s - {msg}")
-                print(f"    Result: {py_result['result'][:100]}")
-                print(f"    Stats: {py_result['stats']}")
-                
-                test_result["python"] = {
-                    "result": py_result["result"],
-                    "stats": py_result["stats"],
-                    "duration": py_result["duration"],
-                    "valid": valid,
-                    "validation_message": msg
-                }
-        
-        # Run Go test
-        if impl in ["go", "both"]:
-            print("  Running Go...", end=" ", flush=True)
-            go_result = run_go_test(test)
-            
-            if "error" in go_result:
-                print(f"❌ ERROR: {go_result['error']}")
-                test_result["go"] = {"error": go_result["error"]}
-            else:
-                valid, msg = test.validate(go_result["result"])
-                status = "✅" if valid else "❌"
-                print(f"{status} {go_result['duration']:.2f}s - {msg}")
-                print(f"    Result: {go_result['result'][:100]}")
-                print(f"    Stats: {go_result['stats']}")
-                
-                test_result["go"] = {
-                    "result": go_result["result"],
-                    "stats": go_result["stats"],
-                    "duration": go_result["duration"],
-                    "valid": valid,
-                    "validation_message": msg
-                }
-        
-        # Compare results if both ran
-        if "python" in test_result and "go" in test_result:
-            if "error" not in test_result["python"] and "error" not in test_result["go"]:
-                py_valid = test_result["python"]["valid"]
-                go_valid = test_result["go"]["valid"]
-                
-                if py_valid and go_valid:
-                    test_result["parity"] = "✅ BOTH PASS"
-                elif not py_valid and not go_valid:
-                    test_result["parity"] = "⚠️  BOTH FAIL"
-                elif py_valid:
-                    test_result["parity"] = "❌ PYTHON ONLY"
-                else:
-                    test_result["parity"] = "❌ GO ONLY"
-                
-                print(f"  Parity: {test_result['parity']}")
+    log.info(f"\n{'='*80}")
+    log.info(f"RLM PATTERN-BASED TEST SUITE")
+    log.info(f"Based on: https://alexzhang13.github.io/blog/2025/rlm/")
+    log.info(f"{'='*80}\n")
+    
+    if resume:
+        output_file = resume
+        recorded = _load_recorded(resume)
+        done = {entry["name"] for entry in recorded}
+        tests = [t for t in TEST_CASES if t.name not in done]
+        log.info(f"Resuming {output_file}: {len(done)} tests already completed, {len(tests)} to run")
+    else:
+        output_file = f"test_results_{impl}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        recorded = []
+        tests = TEST_CASES
+    
+    with open(output_file, 'ab') as out:
+        if not resume:
+            out.write(_dump_line({"timestamp": results["timestamp"], "model": MODEL, "impl": impl}))
+            out.flush()
         
-        results["tests"].append(test_result)
+        if processes > 1 and len(tests) > 1:
+            results["tests"] = recorded + _run_sharded(tests, impl, concurrency, out, verbose, processes)
+        else:
+            results["tests"] = recorded + _run_tests(tests, impl, concurrency, out, verbose)
     
     # Summary
-    print(f"\n{'='*80}")
-    print("SUMMARY BY CATEGORY")
-    print(f"{'='*80}\n")
+    log.info(f"\n{'='*80}")
+    log.info("SUMMARY BY CATEGORY")
+    log.info(f"{'='*80}\n")
     
-    categories = {}
+    total, py_pass, go_pass, both_pass = Counter(), Counter(), Counter(), Counter()
     for test in results["tests"]:
         cat = test["category"]
-        if cat not in categories:
-            categories[cat] = {"total": 0, "py_pass": 0, "go_pass": 0, "both_pass": 0}
-        
-        categories[cat]["total"] += 1
-        
-        if "python" in test and test["python"].get("valid"):
-            categories[cat]["py_pass"] += 1
-        if "go" in test and test["go"].get("valid"):
-            categories[cat]["go_pass"] += 1
-        if (test.get("python", {}).get("valid") and test.get("go", {}).get("valid")):
-            categories[cat]["both_pass"] += 1
-    
-    for cat, stats in sorted(categories.items()):
-        print(f"{cat:20} | Total: {stats['total']:2} | "
-              f"Python: {stats['py_pass']:2}/{stats['total']:2} | "
-              f"Go: {stats['go_pass']:2}/{stats['total']:2} | "
-              f"Both: {stats['both_pass']:2}/{stats['total']:2}")
-    
-    # Save results
-    output_file = f"test_results_{impl}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    print(f"\n✅ Results saved to: {output_file}\n")
+        total[cat] += 1
+        py_pass[cat] += bool(test["py_valid"])
+        go_pass[cat] += bool(test["go_valid"])
+        both_pass[cat] += bool(test["py_valid"] and test["go_valid"])
+    
+    for cat in sorted(total):
+        log.info(f"{cat:20} | Total: {total[cat]:2} | "
+              f"Python: {py_pass[cat]:2}/{total[cat]:2} | "
+              f"Go: {go_pass[cat]:2}/{total[cat]:2} | "
+              f"Both: {both_pass[cat]:2}/{total[cat]:2}")
+    
+    log.info(f"\n✅ Results saved to: {output_file}\n")
+    _flush_log()
     
     return results
 
@@ -558,21 +924,55 @@ if __name__ == "__main__":
     parser.add_argument("--impl", choices=["python", "go", "both"], default="both",
                         help="Which implementation to test")
     parser.add_argument("--category", help="Only run tests from specific category")
-    parser.add_argument("--test", help="Only run specific test by name")
+    parser.add_argument("--test", help="Only run specific test(s) by name, comma-separated")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum number of tests to run at once")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Shard the tests across this many worker processes")
+    parser.add_argument("--resume", metavar="RESULTS_JSONL",
+                        help="Skip tests already completed without error in this results file and append to it")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Also print each test's query, context size, result and stats")
+    parser.add_argument("--store-full-results", action=argparse.BooleanOptionalAction, default=False,
+                        help=f"Store result bodies in full (default: truncate those over {STORED_RESULT_CHARS} "
+                             f"chars and write the full body to results_bodies/<digest>.txt)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the on-disk response cache")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="Re-run every test and overwrite its cached response")
     
     args = parser.parse_args()
+    USE_CACHE = not args.no_cache
+    REFRESH_CACHE = args.refresh_cache
+    STORE_FULL_RESULTS = args.store_full_results
     
     # Filter tests if requested
     if args.category:
-        TEST_CASES = [t for t in TEST_CASES if t.category == args.category]
+        TEST_CASES = list(TESTS_BY_CATEGORY.get(args.category, []))
         print(f"Running only '{args.category}' tests ({len(TEST_CASES)} tests)")
     
     if args.test:
-        TEST_CASES = [t for t in TEST_CASES if t.name == args.test]
-        print(f"Running only '{args.test}' test")
+        names = list(dict.fromkeys(name.strip() for name in args.test.split(",") if name.strip()))
+        unknown = [name for name in names if name not in TEST_BY_NAME]
+        if unknown:
+            print(f"Unknown test(s): {', '.join(unknown)}")
+            sys.exit(1)
+        TEST_CASES = [TEST_BY_NAME[name] for name in names
+                      if not args.category or TEST_BY_NAME[name].category == args.category]
+        print(f"Running only {', '.join(repr(t.name) for t in TEST_CASES)} ({len(TEST_CASES)} tests)")
     
     if not TEST_CASES:
         print("No tests to run!")
         sys.exit(1)
     
-    run_all_tests(impl=args.impl)
+    if args.resume:
+        if not os.path.isfile(args.resume):
+            print(f"Results file to resume not found: {args.resume}")
+            sys.exit(1)
+        recorded_impl = _recorded_impl(args.resume)
+        if recorded_impl != args.impl:
+            print(f"{args.resume} holds results for --impl {recorded_impl}; resume it with that --impl")
+            sys.exit(1)
+    
+    run_all_tests(impl=args.impl, concurrency=args.concurrency, resume=args.resume, verbose=args.verbose,
+                  processes=args.processes)